@@ -1,18 +1,40 @@
 import os
+import re
 import sys
 import json
 import psutil
+import signal
 import argparse
-import subprocess
-import threading
+import datetime
+import heapq
+from collections import deque
+from functools import lru_cache
 from typing import Optional, TypedDict
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QCheckBox, QTextEdit, QGroupBox, QTextBrowser, QSplitter, QComboBox, QFileDialog
+    QLabel, QLineEdit, QPushButton, QCheckBox, QTextEdit, QPlainTextEdit, QGroupBox, QTextBrowser, QSplitter, QComboBox, QFileDialog,
+    QInputDialog, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal, QObject, QTimer, QSettings
-from PySide6.QtGui import QTextCursor, QIcon, QKeyEvent, QFont, QFontDatabase, QPalette, QColor, QShortcut, QKeySequence
+from PySide6.QtCore import Qt, Slot, QEvent, QRect, QTimer, QSettings, QProcess, QProcessEnvironment
+from PySide6.QtGui import (
+    QTextCursor, QIcon, QKeyEvent, QFont, QFontDatabase, QPalette, QColor, QShortcut, QKeySequence,
+    QPainter, QSyntaxHighlighter, QTextCharFormat, QTextDocument
+)
+
+# Number of feedback history entries to keep
+HISTORY_SIZE = 20
+
+# Console font sizes in points
+DEFAULT_FONT_SIZE = 9
+MIN_FONT_SIZE = 6
+MAX_FONT_SIZE = 20
+
+# Number of log lines kept in memory and in the console
+MAX_LOG_LINES = 10000
+
+# Log lines longer than this are shown truncated and without highlighting
+MAX_HIGHLIGHT_LENGTH = 4096
 
 class FeedbackResult(TypedDict):
     command_logs: str
@@ -23,62 +45,128 @@ class FeedbackConfig(TypedDict):
     execute_automatically: bool = False
     command_templates: list = []  # List of saved command templates
 
-def detect_log_level(line: str) -> str:
-    """Detect log level from line content"""
-    import re
-
-    if re.search(r'\b(error|ERROR|Error|failed|FAILED|Failed|exception|Exception|EXCEPTION)\b', line):
-        return "Error"
-    elif re.search(r'\b(warning|WARNING|Warning|warn|WARN|Warn)\b', line):
-        return "Warning"
-    elif re.search(r'\b(success|SUCCESS|Success|passed|PASSED|Passed|completed|COMPLETED|Completed|✓|✔)\b', line):
-        return "Success"
-    elif re.search(r'\b(info|INFO|Info|note|NOTE|Note)\b', line):
-        return "Info"
-    else:
-        return "Other"
-
-def highlight_log_line(line: str) -> str:
-    """Apply syntax highlighting to a log line"""
-    import re
-
-    # Escape HTML special characters
-    line = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-
-    # Error patterns (red)
-    if re.search(r'\b(error|ERROR|Error|failed|FAILED|Failed|exception|Exception|EXCEPTION)\b', line):
-        return f'<span style="color: #e74c3c; font-weight: bold;">{line}</span>'
-
-    # Warning patterns (yellow/orange)
-    if re.search(r'\b(warning|WARNING|Warning|warn|WARN|Warn)\b', line):
-        return f'<span style="color: #f39c12; font-weight: bold;">{line}</span>'
-
-    # Success patterns (green)
-    if re.search(r'\b(success|SUCCESS|Success|passed|PASSED|Passed|completed|COMPLETED|Completed|✓|✔)\b', line):
-        return f'<span style="color: #2ecc71; font-weight: bold;">{line}</span>'
+# Log level keywords, one named group per level
+_RE_LEVEL = re.compile(
+    r'(?P<Error>\b(?:error|failed|exception)\b)'
+    r'|(?P<Warning>\b(?:warning|warn)\b)'
+    r'|(?P<Success>\b(?:success|passed|completed)\b|[✓✔])'
+    r'|(?P<Info>\b(?:info|note)\b)',
+    re.IGNORECASE
+)
 
-    # Info patterns (blue)
-    if re.search(r'\b(info|INFO|Info|note|NOTE|Note)\b', line):
-        return f'<span style="color: #3498db;">{line}</span>'
+# Log levels in precedence order: when a line contains keywords of several
+# levels, the one with the lowest index wins. Per-level log buffers use the index.
+_LOG_LEVELS = ("Error", "Warning", "Success", "Info", "Other")
+_LEVEL_INDEX = {level: index for index, level in enumerate(_LOG_LEVELS)}
+_LEVEL_OTHER = _LEVEL_INDEX["Other"]
+
+def _char_format(color: str, bold: bool = False, underline: bool = False) -> QTextCharFormat:
+    char_format = QTextCharFormat()
+    char_format.setForeground(QColor(color))
+    if bold:
+        char_format.setFontWeight(QFont.Bold)
+    if underline:
+        char_format.setFontUnderline(True)
+    return char_format
+
+# Whole-line formats for classified log lines
+_LEVEL_FORMAT = {
+    "Error": _char_format("#e74c3c", bold=True),  # red
+    "Warning": _char_format("#f39c12", bold=True),  # yellow/orange
+    "Success": _char_format("#2ecc71", bold=True),  # green
+    "Info": _char_format("#3498db"),  # blue
+}
+
+# Inline log decorations, one named group per kind. Earlier alternatives win
+# at the same position, so timestamps are not split into numbers.
+_RE_DECOR = re.compile(
+    r'(?P<timestamp>\d{2}:\d{2}:\d{2})'
+    r'|(?P<url>https?://[^\s]+)'
+    r'|(?P<path>[/\\][\w/\\.-]+\.\w+)'
+    r'|(?P<number>\b\d+\b)'
+)
 
-    # File paths (cyan)
-    line = re.sub(r'([/\\][\w/\\.-]+\.\w+)', r'<span style="color: #1abc9c;">\1</span>', line)
+_DECOR_FORMAT = {
+    "timestamp": _char_format("#95a5a6"),  # gray
+    "url": _char_format("#3498db", underline=True),  # blue underline
+    "path": _char_format("#1abc9c"),  # cyan
+    "number": _char_format("#9b59b6"),  # purple
+}
 
-    # URLs (blue underline)
-    line = re.sub(r'(https?://[^\s]+)', r'<span style="color: #3498db; text-decoration: underline;">\1</span>', line)
+def _utf16_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
 
-    # Numbers (purple)
-    line = re.sub(r'\b(\d+)\b', r'<span style="color: #9b59b6;">\1</span>', line)
+def detect_log_level(line: str) -> str:
+    """Detect log level from line content"""
+    level = "Other"
+    # The level keyword is practically always near the start of the line
+    for match in _RE_LEVEL.finditer(line, 0, MAX_HIGHLIGHT_LENGTH):
+        found = match.lastgroup
+        if found == "Error":
+            return found
+        if _LEVEL_INDEX[found] < _LEVEL_INDEX[level]:
+            level = found
+    return level
+
+def log_line_formats(line: str, level: str) -> tuple[tuple[int, int, QTextCharFormat], ...]:
+    """(start, length, format) ranges for a log line already classified by detect_log_level"""
+    # Error/Warning/Success/Info lines are colored as a whole
+    char_format = _LEVEL_FORMAT.get(level)
+    if char_format:
+        ranges = [(0, len(line), char_format)]
+    else:
+        # Timestamps, URLs, file paths and numbers in a single pass
+        ranges = [
+            (match.start(), match.end() - match.start(), _DECOR_FORMAT[match.lastgroup])
+            for match in _RE_DECOR.finditer(line)
+        ]
+
+    # Qt positions count UTF-16 code units, characters outside the BMP take two
+    if ranges and not line.isascii() and max(line) > "\uffff":
+        ranges = [
+            (_utf16_len(line[:start]), _utf16_len(line[start:start + length]), char_format)
+            for start, length, char_format in ranges
+        ]
+    return tuple(ranges)
+
+@lru_cache(maxsize=4096)
+def _classify_log_line(line: str) -> tuple[str, tuple[tuple[int, int, QTextCharFormat], ...]]:
+    """Return (level, format ranges), cached since builds and retry loops repeat lines"""
+    level = detect_log_level(line)
+    return level, log_line_formats(line, level)
+
+def classify_log_text(text: str) -> list[tuple[str, str]]:
+    """Split log output into (line, level) entries"""
+    entries = []
+    for line in text.removesuffix('\n').split('\n'):
+        if len(line) > MAX_HIGHLIGHT_LENGTH:
+            # Shown without highlighting and too big to keep in the cache
+            entries.append((line, detect_log_level(line)))
+        else:
+            entries.append((line, _classify_log_line(line)[0]))
+    return entries
+
+def log_display_text(line: str) -> str:
+    """Text shown in the console for a log line"""
+    # Huge lines (minified code, base64 blobs, ...) are cut short
+    if len(line) > MAX_HIGHLIGHT_LENGTH:
+        return line[:MAX_HIGHLIGHT_LENGTH] + '… (truncated)'
+    return line
 
-    # Timestamps (gray)
-    line = re.sub(r'(\d{2}:\d{2}:\d{2})', r'<span style="color: #95a5a6;">\1</span>', line)
+# Inline markdown formatting, matched in a single pass per line
+_RE_INLINE_MD = re.compile(
+    r'\*\*(?P<bold>.+?)\*\*'
+    r'|__(?P<bold_alt>.+?)__'
+    r'|\*(?P<italic>(?:\*\*.+?\*\*|[^*])+)\*'  # may contain **bold**
+    r'|`(?P<code>.+?)`'
+)
 
-    return line
+# List items only support bold and inline code
+_RE_INLINE_MD_LIST = re.compile(r'\*\*(?P<bold>.+?)\*\*|`(?P<code>.+?)`')
 
+@lru_cache(maxsize=16)
 def markdown_to_html(markdown_text: str, is_dark_theme: bool = True) -> str:
-    """Convert markdown to HTML with proper formatting support"""
-    import re
-
+    """Convert markdown to HTML with proper formatting support (cached, the prompt doesn't change)"""
     # Theme colors
     if is_dark_theme:
         text_color = "#ecf0f1"
@@ -91,6 +179,19 @@ def markdown_to_html(markdown_text: str, is_dark_theme: bool = True) -> str:
         code_color = "#c7254e"
         header_color = "#0056b3"
 
+    code_open = f'<code style="background-color: {code_bg}; padding: 1px 4px; border-radius: 2px; color: {code_color}; font-size: 10pt;">'
+
+    def format_inline(match: re.Match) -> str:
+        kind = match.lastgroup
+        content = match.group(kind)
+        if kind == "code":
+            return f'{code_open}{content}</code>'
+        # Bold and italic text may contain further formatting
+        content = match.re.sub(format_inline, content)
+        if kind == "italic":
+            return f'<i>{content}</i>'
+        return f'<b>{content}</b>'
+
     lines = markdown_text.split('\n')
     html_lines = []
     in_code_block = False
@@ -98,8 +199,10 @@ def markdown_to_html(markdown_text: str, is_dark_theme: bool = True) -> str:
     in_list = False
 
     for line in lines:
+        stripped = line.strip()
+
         # Code blocks
-        if line.strip().startswith('```'):
+        if stripped.startswith('```'):
             if in_code_block:
                 # End code block
                 code_content = '\n'.join(code_block_content)
@@ -127,14 +230,13 @@ def markdown_to_html(markdown_text: str, is_dark_theme: bool = True) -> str:
             continue
 
         # Lists
-        if line.strip().startswith('- '):
+        if stripped.startswith('- '):
             if not in_list:
                 html_lines.append('<ul style="margin: 3px 0; padding-left: 20px;">')
                 in_list = True
-            content = line.strip()[2:]
+            content = stripped[2:]
             # Process inline formatting
-            content = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', content)
-            content = re.sub(r'`(.+?)`', f'<code style="background-color: {code_bg}; padding: 1px 4px; border-radius: 2px; color: {code_color}; font-size: 10pt;">\\1</code>', content)
+            content = _RE_INLINE_MD_LIST.sub(format_inline, content)
             html_lines.append(f'<li style="margin: 2px 0; font-size: 11pt;">{content}</li>')
             continue
         else:
@@ -143,19 +245,12 @@ def markdown_to_html(markdown_text: str, is_dark_theme: bool = True) -> str:
                 in_list = False
 
         # Empty lines - use double <br> to create proper paragraph spacing
-        if not line.strip():
+        if not stripped:
             html_lines.append('<br><br>')
             continue
 
-        # Regular text with inline formatting
-        processed_line = line
-        # Bold
-        processed_line = re.sub(r'\*\*(.+?)\*\*', r'<b>\1</b>', processed_line)
-        processed_line = re.sub(r'__(.+?)__', r'<b>\1</b>', processed_line)
-        # Italic
-        processed_line = re.sub(r'\*([^*]+?)\*', r'<i>\1</i>', processed_line)
-        # Inline code
-        processed_line = re.sub(r'`(.+?)`', f'<code style="background-color: {code_bg}; padding: 1px 4px; border-radius: 2px; color: {code_color}; font-size: 10pt;">\\1</code>', processed_line)
+        # Regular text with inline formatting (bold, italic, inline code)
+        processed_line = _RE_INLINE_MD.sub(format_inline, line)
 
         # Add line break after each regular text line to preserve single \n
         html_lines.append(f'<span style="font-size: 11pt;">{processed_line}</span><br>')
@@ -244,29 +339,57 @@ def get_light_mode_palette(app: QApplication):
     lightPalette.setColor(QPalette.HighlightedText, Qt.white)
     return lightPalette
 
-def kill_tree(process: subprocess.Popen):
-    killed: list[psutil.Process] = []
-    parent = psutil.Process(process.pid)
-    for proc in parent.children(recursive=True):
+def kill_tree(process: QProcess):
+    pid = process.processId()
+    if not pid:
+        # Not running (killpg(0) would signal our own process group)
+        return
+
+    if sys.platform != "win32":
+        # The command runs in its own session, so its process group covers the whole tree
         try:
-            proc.kill()
-            killed.append(proc)
-        except psutil.Error:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
             pass
-    try:
-        parent.kill()
-    except psutil.Error:
-        pass
-    killed.append(parent)
-
-    # Terminate any remaining processes
-    for proc in killed:
+    else:
+        killed: list[psutil.Process] = []
+        parent = psutil.Process(pid)
+        for proc in parent.children(recursive=True):
+            try:
+                proc.kill()
+                killed.append(proc)
+            except psutil.Error:
+                pass
         try:
-            if proc.is_running():
-                proc.terminate()
+            parent.kill()
+            killed.append(parent)
         except psutil.Error:
             pass
 
+        # Reap the killed processes
+        psutil.wait_procs(killed, timeout=1.0)
+
+    # Emits finished, which resets the UI
+    process.waitForFinished(1000)
+
+def decode_output(data: bytes) -> str:
+    """Decode command output, normalizing newlines like text mode would"""
+    text = data.decode("utf-8", errors="ignore")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+# Windows paths use backslashes and an uppercase drive letter
+if sys.platform == "win32":
+    def format_windows_path(path: str) -> str:
+        # Convert forward slashes to backslashes
+        path = path.replace("/", "\\")
+        # Capitalize drive letter if path starts with x:\
+        if len(path) >= 2 and path[1] == ":" and path[0].isalpha():
+            path = path[0].upper() + path[1:]
+        return path
+else:
+    def format_windows_path(path: str) -> str:
+        return path
+
 def get_user_environment() -> dict[str, str]:
     if sys.platform != "win32":
         return os.environ.copy()
@@ -317,29 +440,24 @@ def get_user_environment() -> dict[str, str]:
         try:
             # Convert environment block to list of strings
             result = {}
-            env_ptr = ctypes.cast(environment, ctypes.POINTER(ctypes.c_wchar))
-            offset = 0
+            address = environment.value
 
             while True:
-                # Get string at current offset
-                current_string = ""
-                while env_ptr[offset] != "\0":
-                    current_string += env_ptr[offset]
-                    offset += 1
-
-                # Skip null terminator
-                offset += 1
+                # Read the null-terminated string at the current address
+                current_string = ctypes.wstring_at(address)
 
                 # Break if we hit double null terminator
                 if not current_string:
                     break
 
-                equal_index = current_string.index("=")
-                if equal_index == -1:
+                # Skip the string and its null terminator (measured in UTF-16 so
+                # characters outside the BMP count as two code units)
+                address += len(current_string.encode("utf-16-le")) + ctypes.sizeof(ctypes.c_wchar)
+
+                key, separator, value = current_string.partition("=")
+                if not separator:
                     continue
 
-                key = current_string[:equal_index]
-                value = current_string[equal_index + 1:]
                 result[key] = value
 
             return result
@@ -350,6 +468,19 @@ def get_user_environment() -> dict[str, str]:
     finally:
         CloseHandle(token)
 
+def format_history_entry(entry: dict) -> str:
+    """Display text for a history entry: its time and the first 50 chars of feedback"""
+    feedback = entry.get("feedback", "")
+    display_text = feedback[:50] + "..." if len(feedback) > 50 else feedback
+    timestamp = entry.get("timestamp", "")
+    if timestamp:
+        try:
+            time_str = datetime.datetime.fromisoformat(timestamp).strftime("%m/%d %H:%M")
+        except (TypeError, ValueError):
+            return display_text
+        display_text = f"[{time_str}] {display_text}"
+    return display_text
+
 class DragDropLineEdit(QLineEdit):
     """QLineEdit with drag & drop support for files"""
     def __init__(self, parent=None):
@@ -395,8 +526,120 @@ class FeedbackTextEdit(QTextEdit):
         else:
             super().keyPressEvent(event)
 
-class LogSignals(QObject):
-    append_log = Signal(str)
+class LogHighlighter(QSyntaxHighlighter):
+    """Colors each log line by its level, or its timestamps, URLs, paths and numbers"""
+    def highlightBlock(self, text: str):
+        # Long lines are truncated for display and left plain
+        if not text or len(text) > MAX_HIGHLIGHT_LENGTH:
+            return
+        for start, length, char_format in _classify_log_line(text)[1]:
+            self.setFormat(start, length, char_format)
+
+class LineNumberArea(QWidget):
+    """Gutter painted by its LogView"""
+    def __init__(self, log_view: "LogView"):
+        super().__init__(log_view)
+        self.log_view = log_view
+
+    def sizeHint(self):
+        return self.log_view.line_number_area_size_hint()
+
+    def paintEvent(self, event):
+        self.log_view.paint_line_numbers(event)
+
+class LogView(QPlainTextEdit):
+    """Read-only log console, one block per log line with its line number as the block's user state"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.highlighter = LogHighlighter(self.document())
+
+        self._show_line_numbers = False
+        self.line_number_area = LineNumberArea(self)
+        self.line_number_area.hide()
+        self.blockCountChanged.connect(self._update_line_number_area_width)
+        self.updateRequest.connect(self._update_line_number_area)
+
+    def append_lines(self, lines: list[tuple[int, str]]):
+        """Append (line_number, text) pairs as one block each, in a single edit block"""
+        document = self.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        # An empty document already has the block for the first line
+        new_block = not document.isEmpty()
+        for line_number, text in lines:
+            if new_block:
+                cursor.insertBlock()
+            new_block = True
+            cursor.insertText(text)
+            cursor.block().setUserState(line_number)
+        cursor.endEditBlock()
+        # The block count stops changing once the document is full, but the numbers get wider
+        self._update_line_number_area_width()
+
+    def set_line_numbers_visible(self, visible: bool):
+        self._show_line_numbers = visible
+        self.line_number_area.setVisible(visible)
+        self._update_line_number_area_width()
+
+    def line_number_area_width(self) -> int:
+        if not self._show_line_numbers:
+            return 0
+        digits = max(4, len(str(self.document().lastBlock().userState())))
+        return 8 + self.fontMetrics().horizontalAdvance("9") * digits
+
+    def line_number_area_size_hint(self):
+        size = self.line_number_area.minimumSizeHint()
+        size.setWidth(self.line_number_area_width())
+        return size
+
+    @Slot()
+    def _update_line_number_area_width(self):
+        width = self.line_number_area_width()
+        if width != self.viewportMargins().left():
+            self.setViewportMargins(width, 0, 0, 0)
+
+    @Slot(QRect, int)
+    def _update_line_number_area(self, rect: QRect, dy: int):
+        if not self._show_line_numbers:
+            return
+        if dy:
+            self.line_number_area.scroll(0, dy)
+        else:
+            self.line_number_area.update(0, rect.y(), self.line_number_area.width(), rect.height())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        contents = self.contentsRect()
+        self.line_number_area.setGeometry(
+            contents.left(), contents.top(), self.line_number_area_width(), contents.height()
+        )
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self._update_line_number_area_width()
+
+    def paint_line_numbers(self, event):
+        """Paint the line numbers of the visible blocks, only those intersecting the exposed area"""
+        painter = QPainter(self.line_number_area)
+        painter.fillRect(event.rect(), self.palette().color(QPalette.Window))
+        painter.setPen(QColor("#95a5a6"))
+
+        width = self.line_number_area.width() - 4
+        height = self.fontMetrics().height()
+        block = self.firstVisibleBlock()
+        top = round(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
+        bottom = top + round(self.blockBoundingRect(block).height())
+        while block.isValid() and top <= event.rect().bottom():
+            line_number = block.userState()
+            if block.isVisible() and bottom >= event.rect().top() and line_number > 0:
+                painter.drawText(0, top, width, height, Qt.AlignRight, str(line_number))
+            block = block.next()
+            top = bottom
+            bottom = top + round(self.blockBoundingRect(block).height())
+        painter.end()
 
 class FeedbackUI(QMainWindow):
     def __init__(self, project_directory: str, prompt: str):
@@ -404,20 +647,63 @@ class FeedbackUI(QMainWindow):
         self.project_directory = project_directory
         self.prompt = prompt
         self.config_path = os.path.join(project_directory, ".user-feedback.json")
-        self.history_path = os.path.join(project_directory, ".user-feedback-history.json")
+        self.history_path = os.path.join(project_directory, ".user-feedback-history.jsonl")
+        self.legacy_history_path = os.path.join(project_directory, ".user-feedback-history.json")
         self.config = self._load_config()
+        # Membership checks for the saved templates, the config lists keep their order
+        self._templates_set = set(self.config.get("command_templates", []))
+        self._feedback_templates_set = set(self.config.get("feedback_templates", []))
         self.history = self._load_history()
 
-        # Load theme preference
+        # Read the window settings once up front; changes are kept in memory and written
+        # once they settle for a moment, and in closeEvent
         self.settings = QSettings("UserFeedback", "MainWindow")
-        self.is_dark_theme = self.settings.value("dark_theme", True, type=bool)
-
-        self.process: Optional[subprocess.Popen] = None
-        self.log_buffer = []
-        self.log_entries = []  # Store log entries with metadata: [(line, level, line_number), ...]
+        self._settings_cache = {
+            "dark_theme": self.settings.value("dark_theme", True, type=bool),
+            "show_command": self.settings.value("show_command", True, type=bool),
+            "show_console": self.settings.value("show_console", True, type=bool),
+            "show_line_numbers": self.settings.value("show_line_numbers", False, type=bool),
+            "console_font_size": self.settings.value("console_font_size", DEFAULT_FONT_SIZE, type=int),
+            "splitter_sizes": self.settings.value("splitter_sizes"),
+            "geometry": self.settings.value("geometry"),
+            "windowState": self.settings.value("windowState"),
+        }
+        self._dirty_settings: set[str] = set()
+        self._settings_flush_timer = QTimer(self)
+        self._settings_flush_timer.setSingleShot(True)
+        self._settings_flush_timer.setInterval(2000)
+        self._settings_flush_timer.timeout.connect(self._flush_settings)
+        self.is_dark_theme = self._settings_cache["dark_theme"]
+        self._log_filter = "All"
+
+        self.process: Optional[QProcess] = None
+        # Raw output as (text, line count) chunks, bounded to MAX_LOG_LINES lines in total
+        self.log_buffer: deque[tuple[str, int]] = deque()
+        self._log_buffer_lines = 0
+        self._dropped_log_lines = 0
+        # Log entries as (line number, display text), all of them and one ring buffer per level
+        # (indexed like _LOG_LEVELS) so a filter only walks the lines it shows
+        self.log_lines: deque[tuple[int, str]] = deque(maxlen=MAX_LOG_LINES)
+        self.log_lines_by_level = tuple(deque(maxlen=MAX_LOG_LINES) for _ in _LOG_LEVELS)
+        # Line numbers keep counting once the oldest entries are dropped
+        self._next_line_number = 1
         self.feedback_result = None
-        self.log_signals = LogSignals()
-        self.log_signals.append_log.connect(self._append_log)
+
+        # Command output is queued here as complete lines and appended in batches
+        self._pending_logs: list[str] = []
+        self._output_partial = bytearray()
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(40)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
+
+        # Last search as (lowercased text, first match position or -1), reset whenever the logs change
+        self._search_anchor: Optional[tuple[str, int]] = None
+        # Searching waits until typing pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._search_logs)
 
         self.setWindowTitle("User Feedback")
         self.setWindowIcon(QIcon("icons/feedback.png"))
@@ -426,8 +712,7 @@ class FeedbackUI(QMainWindow):
         self._create_ui()
 
         # Restore window geometry
-        settings = QSettings("UserFeedback", "MainWindow")
-        geometry = settings.value("geometry")
+        geometry = self._settings_cache.get("geometry")
         if geometry:
             self.restoreGeometry(geometry)
         else:
@@ -439,9 +724,9 @@ class FeedbackUI(QMainWindow):
             self.move(x, y)
 
         # Restore window state
-        state = settings.value("windowState")
-        if state:
-            self.restoreState(state)
+        window_state = self._settings_cache.get("windowState")
+        if window_state:
+            self.restoreState(window_state)
 
         set_dark_title_bar(self, True)
 
@@ -457,49 +742,87 @@ class FeedbackUI(QMainWindow):
             pass
         return FeedbackConfig(run_command="", execute_automatically=False)
 
+    def _set_setting(self, key: str, value):
+        """Update a window setting in memory, to be written after 2 seconds without changes"""
+        self._settings_cache[key] = value
+        self._dirty_settings.add(key)
+        self._settings_flush_timer.start()
+
+    @Slot()
+    def _flush_settings(self):
+        """Write the changed window settings to QSettings"""
+        self._settings_flush_timer.stop()
+        for key in self._dirty_settings:
+            self.settings.setValue(key, self._settings_cache[key])
+        self._dirty_settings.clear()
+
+    @Slot()
     def _save_config(self):
         with open(self.config_path, "w") as f:
             json.dump(self.config, f, indent=2)
 
     def _load_history(self) -> list:
-        """Load feedback history from file"""
+        """Load feedback history from file (one JSON entry per line)"""
+        history = []
+        rewrite = False
         try:
             if os.path.exists(self.history_path):
-                with open(self.history_path, "r") as f:
-                    return json.load(f)
+                with open(self.history_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A partial line from an interrupted append, the rewrite below drops it
+                            rewrite = True
+                            continue
+                        if isinstance(entry, dict):
+                            history.append(entry)
+                        else:
+                            rewrite = True
+            elif os.path.exists(self.legacy_history_path):
+                # Convert history saved as a single JSON list by older versions
+                with open(self.legacy_history_path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, list):
+                    history = [entry for entry in entries if isinstance(entry, dict)]
+                rewrite = True
         except Exception:
             pass
-        return []
 
-    def _save_history(self):
-        """Save feedback history to file (keep last 20 entries)"""
+        # Entries are appended, so the file can grow past the limit between runs
+        if len(history) > HISTORY_SIZE:
+            history = history[-HISTORY_SIZE:]
+            rewrite = True
+        if rewrite:
+            self._save_history(history)
+        return history
+
+    def _save_history(self, history: list):
+        """Rewrite the feedback history file"""
         try:
-            # Keep only last 20 entries
-            history_to_save = self.history[-20:] if len(self.history) > 20 else self.history
-            with open(self.history_path, "w") as f:
-                json.dump(history_to_save, f, indent=2)
+            with open(self.history_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in history)
         except Exception as e:
             print(f"Failed to save history: {e}")
 
     def _add_to_history(self, feedback: str):
-        """Add feedback to history"""
-        import datetime
+        """Add feedback to history (keep last HISTORY_SIZE entries)"""
         entry = {
             "timestamp": datetime.datetime.now().isoformat(),
             "feedback": feedback,
             "prompt": self.prompt[:100]  # Store first 100 chars of prompt
         }
         self.history.append(entry)
-        self._save_history()
-
-    def _format_windows_path(self, path: str) -> str:
-        if sys.platform == "win32":
-            # Convert forward slashes to backslashes
-            path = path.replace("/", "\\")
-            # Capitalize drive letter if path starts with x:\
-            if len(path) >= 2 and path[1] == ":" and path[0].isalpha():
-                path = path[0].upper() + path[1:]
-        return path
+        del self.history[:-HISTORY_SIZE]
+
+        # Append only the new entry, the file is trimmed on the next load
+        try:
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            print(f"Failed to save history: {e}")
 
     def _create_menu_bar(self):
         """Create menu bar with View options"""
@@ -511,13 +834,13 @@ class FeedbackUI(QMainWindow):
         # Show Command action
         self.show_command_action = view_menu.addAction("Show &Command")
         self.show_command_action.setCheckable(True)
-        self.show_command_action.setChecked(self.settings.value("show_command", True, type=bool))
+        self.show_command_action.setChecked(self._settings_cache["show_command"])
         self.show_command_action.triggered.connect(self._toggle_command_visibility)
 
         # Show Console action
         self.show_console_action = view_menu.addAction("Show C&onsole")
         self.show_console_action.setCheckable(True)
-        self.show_console_action.setChecked(self.settings.value("show_console", True, type=bool))
+        self.show_console_action.setChecked(self._settings_cache["show_console"])
         self.show_console_action.triggered.connect(self._toggle_console_visibility)
 
         view_menu.addSeparator()
@@ -526,6 +849,7 @@ class FeedbackUI(QMainWindow):
         toggle_theme_action = view_menu.addAction("Toggle &Theme")
         toggle_theme_action.triggered.connect(self._toggle_theme)
 
+    @Slot()
     def _toggle_command_visibility(self, from_button=False):
         """Toggle Command section visibility with collapse/expand"""
         # If called from button, toggle current state
@@ -545,8 +869,9 @@ class FeedbackUI(QMainWindow):
         self.command_collapse_button.setText("▼" if is_visible else "▶")
 
         # Save state
-        self.settings.setValue("show_command", is_visible)
+        self._set_setting("show_command", is_visible)
 
+    @Slot()
     def _toggle_console_visibility(self, from_button=False):
         """Toggle Console section visibility with collapse/expand"""
         # If called from button, toggle current state
@@ -575,7 +900,7 @@ class FeedbackUI(QMainWindow):
         self.console_collapse_button.setText("▼" if is_visible else "▶")
 
         # Save state
-        self.settings.setValue("show_console", is_visible)
+        self._set_setting("show_console", is_visible)
 
     def _create_ui(self):
         # Create menu bar
@@ -606,7 +931,7 @@ class FeedbackUI(QMainWindow):
         command_layout = QVBoxLayout(self.command_group)
 
         # Working directory label
-        formatted_path = self._format_windows_path(self.project_directory)
+        formatted_path = format_windows_path(self.project_directory)
         working_dir_label = QLabel(f"Working directory: {formatted_path}")
         command_layout.addWidget(working_dir_label)
 
@@ -694,7 +1019,7 @@ class FeedbackUI(QMainWindow):
         search_label = QLabel("🔍")
         self.search_entry = QLineEdit()
         self.search_entry.setPlaceholderText("Search in logs...")
-        self.search_entry.textChanged.connect(self._search_logs)
+        self.search_entry.textChanged.connect(self._search_timer.start)
         self.search_entry.returnPressed.connect(self._search_next)
 
         search_prev_button = QPushButton("↑")
@@ -727,7 +1052,7 @@ class FeedbackUI(QMainWindow):
 
         # Line numbers toggle
         self.show_line_numbers_check = QCheckBox("Line #")
-        self.show_line_numbers_check.setChecked(self.settings.value("show_line_numbers", False, type=bool))
+        self.show_line_numbers_check.setChecked(self._settings_cache["show_line_numbers"])
         self.show_line_numbers_check.stateChanged.connect(self._toggle_line_numbers)
 
         filter_layout.addWidget(filter_label)
@@ -737,14 +1062,17 @@ class FeedbackUI(QMainWindow):
         console_layout.addLayout(filter_layout)
 
         # Log text area with syntax highlighting
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setAcceptRichText(True)
-        font = QFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
-        # Restore saved font size or use default (9pt)
-        saved_font_size = self.settings.value("console_font_size", 9, type=int)
-        font.setPointSize(saved_font_size)
-        self.log_text.setFont(font)
+        self.log_text = LogView()
+        # Every log line is its own block, so this drops the oldest lines
+        self.log_text.setMaximumBlockCount(MAX_LOG_LINES)
+        self.log_text.set_line_numbers_visible(self._settings_cache["show_line_numbers"])
+        # Kept to change its size in place
+        self._log_font = QFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        # Restore saved font size or use default
+        saved_font_size = self._settings_cache["console_font_size"]
+        self._log_font.setPointSize(min(max(saved_font_size, MIN_FONT_SIZE), MAX_FONT_SIZE))
+        self.log_text.setFont(self._log_font)
+        self.log_text.document().contentsChanged.connect(self._reset_search_anchor)
         console_layout.addWidget(self.log_text)
 
         # Console buttons
@@ -845,7 +1173,7 @@ class FeedbackUI(QMainWindow):
         self.splitter.addWidget(user_feedback_group)
 
         # Restore splitter sizes or set defaults
-        saved_sizes = self.settings.value("splitter_sizes")
+        saved_sizes = self._settings_cache.get("splitter_sizes")
         if saved_sizes:
             self.splitter.setSizes(saved_sizes)
         else:
@@ -858,8 +1186,8 @@ class FeedbackUI(QMainWindow):
         self._apply_theme()
 
         # Apply initial visibility state
-        show_command = self.settings.value("show_command", True, type=bool)
-        show_console = self.settings.value("show_console", True, type=bool)
+        show_command = self._settings_cache["show_command"]
+        show_console = self._settings_cache["show_console"]
         self.command_group.setVisible(show_command)
         self.console_group.setVisible(show_console)
         self.command_collapse_button.setText("▼" if show_command else "▶")
@@ -911,37 +1239,37 @@ class FeedbackUI(QMainWindow):
         f5_shortcut = QShortcut(QKeySequence("F5"), self)
         f5_shortcut.activated.connect(self._run_command)
 
+    @Slot()
     def _toggle_theme(self):
         """Toggle between dark and light theme"""
         self.is_dark_theme = not self.is_dark_theme
-        self.settings.setValue("dark_theme", self.is_dark_theme)
+        self._set_setting("dark_theme", self.is_dark_theme)
         self.theme_button.setText("🌙 Dark" if self.is_dark_theme else "☀️ Light")
         self._apply_theme()
 
+    def _set_font_size(self, size: int):
+        """Set the console font size, within MIN_FONT_SIZE..MAX_FONT_SIZE"""
+        size = min(max(size, MIN_FONT_SIZE), MAX_FONT_SIZE)
+        if size == self._log_font.pointSize():
+            return
+        self._log_font.setPointSize(size)
+        self.log_text.setFont(self._log_font)
+        self._set_setting("console_font_size", size)
+
+    @Slot()
     def _increase_font_size(self):
         """Increase font size for console"""
-        font = self.log_text.font()
-        current_size = font.pointSize()
-        if current_size < 20:  # Max size
-            font.setPointSize(current_size + 1)
-            self.log_text.setFont(font)
-            self.settings.setValue("console_font_size", current_size + 1)
+        self._set_font_size(self._log_font.pointSize() + 1)
 
+    @Slot()
     def _decrease_font_size(self):
         """Decrease font size for console"""
-        font = self.log_text.font()
-        current_size = font.pointSize()
-        if current_size > 6:  # Min size
-            font.setPointSize(current_size - 1)
-            self.log_text.setFont(font)
-            self.settings.setValue("console_font_size", current_size - 1)
+        self._set_font_size(self._log_font.pointSize() - 1)
 
+    @Slot()
     def _reset_font_size(self):
-        """Reset font size to default (9pt)"""
-        font = self.log_text.font()
-        font.setPointSize(9)
-        self.log_text.setFont(font)
-        self.settings.setValue("console_font_size", 9)
+        """Reset font size to default"""
+        self._set_font_size(DEFAULT_FONT_SIZE)
 
     def _apply_theme(self):
         """Apply the current theme to the application"""
@@ -970,28 +1298,31 @@ class FeedbackUI(QMainWindow):
                     padding: 10px;
                 }
             """)
-        # Re-render markdown with appropriate colors
-        html_content = markdown_to_html(self.prompt, self.is_dark_theme)
-        # Debug: Print first 500 chars of HTML to help diagnose rendering issues
-        print(f"DEBUG: HTML content (first 500 chars):\n{html_content[:500]}\n")
-        self.prompt_display.setHtml(html_content)
+        # Markdown with the theme's colors, rendered once per theme by markdown_to_html's cache
+        self.prompt_display.setHtml(markdown_to_html(self.prompt, self.is_dark_theme))
 
+    @Slot()
     def _update_config(self):
         self.config = {
             "run_command": self.command_entry.text(),
             "execute_automatically": self.auto_check.isChecked(),
-            "command_templates": self.config.get("command_templates", [])
+            "command_templates": self.config.get("command_templates", []),
+            "feedback_templates": self.config.get("feedback_templates", [])
         }
 
     def _populate_templates_combo(self):
         """Populate templates combobox"""
-        self.templates_combo.clear()
-        self.templates_combo.addItem("-- Select template --")
-
-        templates = self.config.get("command_templates", [])
-        for template in templates:
-            self.templates_combo.addItem(template)
+        # No currentIndexChanged or repaint for the intermediate states
+        self.templates_combo.blockSignals(True)
+        self.templates_combo.setUpdatesEnabled(False)
+        try:
+            self.templates_combo.clear()
+            self.templates_combo.addItems(["-- Select template --", *self.config.get("command_templates", [])])
+        finally:
+            self.templates_combo.setUpdatesEnabled(True)
+            self.templates_combo.blockSignals(False)
 
+    @Slot(int)
     def _on_template_selected(self, index: int):
         """Handle template selection"""
         if index > 0:  # Skip placeholder
@@ -1000,15 +1331,17 @@ class FeedbackUI(QMainWindow):
             # Reset to placeholder
             self.templates_combo.setCurrentIndex(0)
 
+    @Slot()
     def _save_template(self):
         """Save current command as template"""
         command = self.command_entry.text().strip()
         if not command:
             return
 
-        templates = self.config.get("command_templates", [])
-        if command not in templates:
+        if command not in self._templates_set:
+            templates = self.config.get("command_templates", [])
             templates.append(command)
+            self._templates_set.add(command)
             self.config["command_templates"] = templates
             self._save_config()
             self._populate_templates_combo()
@@ -1019,25 +1352,21 @@ class FeedbackUI(QMainWindow):
 
     def _populate_history_combo(self):
         """Populate history combobox with recent feedback"""
-        self.history_combo.clear()
-        self.history_combo.addItem("-- Select from history --")
+        # No currentIndexChanged or repaint for the intermediate states
+        self.history_combo.blockSignals(True)
+        self.history_combo.setUpdatesEnabled(False)
+        try:
+            self.history_combo.clear()
+            self.history_combo.addItem("-- Select from history --")
 
-        # Add recent history items (newest first)
-        for entry in reversed(self.history[-10:]):  # Show last 10
-            timestamp = entry.get("timestamp", "")
-            feedback = entry.get("feedback", "")
-            # Create display text (first 50 chars of feedback)
-            display_text = feedback[:50] + "..." if len(feedback) > 50 else feedback
-            if timestamp:
-                try:
-                    import datetime
-                    dt = datetime.datetime.fromisoformat(timestamp)
-                    time_str = dt.strftime("%m/%d %H:%M")
-                    display_text = f"[{time_str}] {display_text}"
-                except:
-                    pass
-            self.history_combo.addItem(display_text, entry)
+            # Add recent history items (newest first)
+            for entry in reversed(self.history[-10:]):  # Show last 10
+                self.history_combo.addItem(format_history_entry(entry), entry)
+        finally:
+            self.history_combo.setUpdatesEnabled(True)
+            self.history_combo.blockSignals(False)
 
+    @Slot(int)
     def _on_history_selected(self, index: int):
         """Handle history selection"""
         if index > 0:  # Skip the placeholder item
@@ -1049,15 +1378,23 @@ class FeedbackUI(QMainWindow):
 
     def _populate_feedback_templates_combo(self):
         """Populate feedback templates combobox"""
-        self.feedback_templates_combo.clear()
-        self.feedback_templates_combo.addItem("-- Insert template --")
+        # No currentIndexChanged or repaint for the intermediate states
+        self.feedback_templates_combo.blockSignals(True)
+        self.feedback_templates_combo.setUpdatesEnabled(False)
+        try:
+            self.feedback_templates_combo.clear()
+            self.feedback_templates_combo.addItem("-- Insert template --")
 
-        templates = self.config.get("feedback_templates", [])
-        for template in templates:
-            # Show first 50 chars in dropdown
-            display_text = template[:50] + "..." if len(template) > 50 else template
-            self.feedback_templates_combo.addItem(display_text, template)
+            templates = self.config.get("feedback_templates", [])
+            for template in templates:
+                # Show first 50 chars in dropdown
+                display_text = template[:50] + "..." if len(template) > 50 else template
+                self.feedback_templates_combo.addItem(display_text, template)
+        finally:
+            self.feedback_templates_combo.setUpdatesEnabled(True)
+            self.feedback_templates_combo.blockSignals(False)
 
+    @Slot(int)
     def _on_feedback_template_selected(self, index: int):
         """Handle feedback template selection - INSERT mode"""
         if index > 0:  # Skip placeholder
@@ -1070,10 +1407,9 @@ class FeedbackUI(QMainWindow):
             # Reset to placeholder
             self.feedback_templates_combo.setCurrentIndex(0)
 
+    @Slot()
     def _save_feedback_template(self):
         """Save current feedback as template"""
-        from PySide6.QtWidgets import QInputDialog
-
         feedback = self.feedback_text.toPlainText().strip()
         if not feedback:
             return
@@ -1086,9 +1422,10 @@ class FeedbackUI(QMainWindow):
         )
 
         if ok:
-            templates = self.config.get("feedback_templates", [])
-            if feedback not in templates:
+            if feedback not in self._feedback_templates_set:
+                templates = self.config.get("feedback_templates", [])
                 templates.append(feedback)
+                self._feedback_templates_set.add(feedback)
                 self.config["feedback_templates"] = templates
                 self._save_config()
                 self._populate_feedback_templates_combo()
@@ -1097,10 +1434,9 @@ class FeedbackUI(QMainWindow):
                 self.feedback_text.setPlaceholderText("✓ Template saved!")
                 QTimer.singleShot(1500, lambda: self.feedback_text.setPlaceholderText(original_text))
 
+    @Slot()
     def _delete_feedback_template(self):
         """Delete selected feedback template"""
-        from PySide6.QtWidgets import QMessageBox
-
         index = self.feedback_templates_combo.currentIndex()
         if index <= 0:  # Skip placeholder
             return
@@ -1119,86 +1455,170 @@ class FeedbackUI(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            templates = self.config.get("feedback_templates", [])
-            if template in templates:
+            if template in self._feedback_templates_set:
+                templates = self.config.get("feedback_templates", [])
                 templates.remove(template)
+                self._feedback_templates_set.discard(template)
                 self.config["feedback_templates"] = templates
                 self._save_config()
                 self._populate_feedback_templates_combo()
 
+    def _buffer_log(self, text: str):
+        """Keep text for copy, export and submit, dropping the oldest lines past MAX_LOG_LINES"""
+        line_count = text.count("\n") + (not text.endswith("\n"))
+        if line_count > MAX_LOG_LINES:
+            excess = line_count - MAX_LOG_LINES
+            text = text.split("\n", excess)[-1]
+            self._dropped_log_lines += excess
+            line_count = MAX_LOG_LINES
+
+        self.log_buffer.append((text, line_count))
+        self._log_buffer_lines += line_count
+        while self._log_buffer_lines > MAX_LOG_LINES:
+            excess = self._log_buffer_lines - MAX_LOG_LINES
+            oldest, oldest_count = self.log_buffer[0]
+            if oldest_count <= excess:
+                # The whole chunk is past the limit
+                self.log_buffer.popleft()
+                dropped = oldest_count
+            else:
+                # Keep the newer lines of the chunk
+                self.log_buffer[0] = (oldest.split("\n", excess)[-1], oldest_count - excess)
+                dropped = excess
+            self._log_buffer_lines -= dropped
+            self._dropped_log_lines += dropped
+
+    def _clear_log_buffer(self):
+        self.log_buffer.clear()
+        self._log_buffer_lines = 0
+        self._dropped_log_lines = 0
+
+    def _iter_logs(self):
+        """The buffered output, starting with a note when earlier lines were dropped"""
+        if self._dropped_log_lines:
+            yield f"... {self._dropped_log_lines} earlier lines dropped\n"
+        for text, _ in self.log_buffer:
+            yield text
+
+    def _joined_logs(self) -> str:
+        return "".join(self._iter_logs())
+
     def _append_log(self, text: str):
-        self.log_buffer.append(text)
+        self._buffer_log(text)
 
-        # Apply syntax highlighting to each line and store metadata
-        lines = text.rstrip().split('\n')
-        for line in lines:
-            level = detect_log_level(line)
-            line_number = len(self.log_entries) + 1
-            self.log_entries.append((line, level, line_number))
+        # Classify each line and store metadata, the highlighter colors them when shown
+        entries = classify_log_text(text)
+
+        # Loop invariants
+        current_filter = self._log_filter
+        filter_all = current_filter == "All"
+        line_number = self._next_line_number - 1
+        log_lines = self.log_lines
+        log_lines_by_level = self.log_lines_by_level
+
+        shown = []
+        for line, level in entries:
+            line_number += 1
+            entry = (line_number, log_display_text(line))
+            log_lines.append(entry)
+            log_lines_by_level[_LEVEL_INDEX[level]].append(entry)
 
             # Apply filter
-            current_filter = self.log_level_filter.currentText()
-            if current_filter != "All" and level != current_filter and level != "Other":
+            if not filter_all and level != current_filter and level != "Other":
                 continue  # Skip lines that don't match filter
 
-            # Add line number if enabled
-            show_line_numbers = self.show_line_numbers_check.isChecked()
-            if show_line_numbers:
-                line_prefix = f'<span style="color: #95a5a6;">{line_number:4d} | </span>'
-            else:
-                line_prefix = ''
+            shown.append(entry)
+        self._next_line_number = line_number + 1
 
-            highlighted = highlight_log_line(line)
-            self.log_text.append(line_prefix + highlighted)
+        # Append all lines and repaint once
+        self.log_text.setUpdatesEnabled(False)
+        if shown:
+            self.log_text.append_lines(shown)
 
         cursor = self.log_text.textCursor()
         cursor.movePosition(QTextCursor.End)
         self.log_text.setTextCursor(cursor)
+        self.log_text.setUpdatesEnabled(True)
+
+    @Slot()
+    def _drain_output(self):
+        """Queue the complete lines read so far, carrying a trailing partial line over"""
+        data = self.process.readAllStandardOutput().data()
+        # A final "\r" may be the first half of a "\r\n" split across reads
+        end = max(data.rfind(b"\n"), data.rfind(b"\r", 0, len(data) - 1)) + 1
+        if not end:
+            self._output_partial += data
+            return
 
+        self._pending_logs.append(decode_output(bytes(self._output_partial) + data[:end]))
+        self._output_partial[:] = data[end:]
+        # Output arriving until the timer fires is appended together
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    @Slot()
+    def _flush_logs(self):
+        """Append the queued command output"""
+        if self._pending_logs:
+            text = "".join(self._pending_logs)
+            self._pending_logs.clear()
+            self._append_log(text)
+
+    @Slot()
     def _apply_log_filter(self):
         """Re-render logs with current filter"""
-        self.log_text.clear()
-        current_filter = self.log_level_filter.currentText()
-        show_line_numbers = self.show_line_numbers_check.isChecked()
-
-        for line, level, line_number in self.log_entries:
-            # Apply filter
-            if current_filter != "All" and level != current_filter and level != "Other":
-                continue
-
-            # Add line number if enabled
-            if show_line_numbers:
-                line_prefix = f'<span style="color: #95a5a6;">{line_number:4d} | </span>'
-            else:
-                line_prefix = ''
+        self._log_filter = current_filter = self.log_level_filter.currentText()
+        if current_filter == "All":
+            shown = list(self.log_lines)
+        else:
+            # The level's lines and the unclassified ones, back in line order
+            buckets = (self.log_lines_by_level[_LEVEL_INDEX[current_filter]], self.log_lines_by_level[_LEVEL_OTHER])
+            # Drop what has already scrolled out of the full log
+            oldest = self.log_lines[0][0] if self.log_lines else self._next_line_number
+            for bucket in buckets:
+                while bucket and bucket[0][0] < oldest:
+                    bucket.popleft()
+            shown = list(heapq.merge(*buckets))
 
-            highlighted = highlight_log_line(line)
-            self.log_text.append(line_prefix + highlighted)
+        self.log_text.clear()
+        self.log_text.append_lines(shown)
 
+    @Slot()
     def _toggle_line_numbers(self):
         """Toggle line numbers display"""
-        self.settings.setValue("show_line_numbers", self.show_line_numbers_check.isChecked())
-        self._apply_log_filter()  # Re-render with/without line numbers
-
-    def _check_process_status(self):
-        if self.process and self.process.poll() is not None:
-            # Process has terminated
-            exit_code = self.process.poll()
+        show_line_numbers = self.show_line_numbers_check.isChecked()
+        self._set_setting("show_line_numbers", show_line_numbers)
+        # Only the gutter changes, the log itself isn't touched
+        self.log_text.set_line_numbers_visible(show_line_numbers)
+
+    @Slot(int, QProcess.ExitStatus)
+    def _on_process_done(self, exit_code: int, exit_status: QProcess.ExitStatus):
+        """Report the command's exit code or crash"""
+        # Append the rest of the output, including an unterminated last line
+        if self._output_partial:
+            self._pending_logs.append(decode_output(bytes(self._output_partial)))
+            self._output_partial.clear()
+        self._log_flush_timer.stop()
+        self._flush_logs()
+
+        if exit_status == QProcess.CrashExit:
+            self._append_log("\nProcess was terminated\n")
+        else:
             self._append_log(f"\nProcess exited with code {exit_code}\n")
-            self.run_button.setText("&Run")
-            self.process = None
-            self.activateWindow()
-            self.feedback_text.setFocus()
+        self.run_button.setText("&Run")
+        self.process.deleteLater()
+        self.process = None
+        self.activateWindow()
+        self.feedback_text.setFocus()
 
+    @Slot()
     def _run_command(self):
         if self.process:
             kill_tree(self.process)
-            self.process = None
-            self.run_button.setText("&Run")
             return
 
         # Clear the log buffer but keep UI logs visible
-        self.log_buffer = []
+        self._clear_log_buffer()
 
         command = self.command_entry.text()
         if not command:
@@ -1209,45 +1629,43 @@ class FeedbackUI(QMainWindow):
         self.run_button.setText("Sto&p")
 
         try:
-            self.process = subprocess.Popen(
-                command,
-                shell=True,
-                cwd=self.project_directory,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=get_user_environment(),
-                text=True,
-                bufsize=1,
-                encoding="utf-8",
-                errors="ignore",
-                close_fds=True,
-            )
-
-            def read_output(pipe):
-                for line in iter(pipe.readline, ""):
-                    self.log_signals.append_log.emit(line)
-
-            threading.Thread(
-                target=read_output,
-                args=(self.process.stdout,),
-                daemon=True
-            ).start()
-
-            threading.Thread(
-                target=read_output,
-                args=(self.process.stderr,),
-                daemon=True
-            ).start()
-
-            # Start process status checking
-            self.status_timer = QTimer()
-            self.status_timer.timeout.connect(self._check_process_status)
-            self.status_timer.start(100)  # Check every 100ms
+            environment = QProcessEnvironment()
+            for key, value in get_user_environment().items():
+                environment.insert(key, value)
+
+            process = QProcess(self)
+            if sys.platform == "win32":
+                # Same command line as subprocess with shell=True
+                process.setProgram(os.environ.get("COMSPEC", "cmd.exe"))
+                process.setNativeArguments(f'/c "{command}"')
+            else:
+                process.setProgram("/bin/sh")
+                process.setArguments(["-c", command])
+                # Lets kill_tree signal the whole process group
+                process.setUnixProcessParameters(QProcess.UnixProcessFlag.CreateNewSession)
+            process.setWorkingDirectory(self.project_directory)
+            # Commands reading stdin get EOF instead of waiting on a pipe nobody writes to
+            process.setStandardInputFile(QProcess.nullDevice())
+            process.setProcessEnvironment(environment)
+
+            # stderr is merged into stdout and read in the GUI thread, one chunk per readyRead
+            process.setProcessChannelMode(QProcess.MergedChannels)
+            self._output_partial.clear()
+            process.readyReadStandardOutput.connect(self._drain_output)
+            process.finished.connect(self._on_process_done)
+
+            self.process = process
+            process.start()
+            if not process.waitForStarted():
+                self.process = None
+                process.deleteLater()
+                raise RuntimeError(process.errorString())
 
         except Exception as e:
             self._append_log(f"Error running command: {str(e)}\n")
             self.run_button.setText("&Run")
 
+    @Slot()
     def _submit_feedback(self):
         feedback_text = self.feedback_text.toPlainText().strip()
 
@@ -1256,28 +1674,62 @@ class FeedbackUI(QMainWindow):
             self._add_to_history(feedback_text)
 
         self.feedback_result = FeedbackResult(
-            logs="".join(self.log_buffer),
+            logs=self._joined_logs(),
             user_feedback=feedback_text,
         )
         self.close()
 
+    @Slot()
     def _search_logs(self):
         """Search for text in logs"""
         search_text = self.search_entry.text()
         if not search_text:
+            self._search_anchor = None
             self.search_result_label.setText("")
             return
 
-        # Move cursor to start for new search
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-        self.log_text.setTextCursor(cursor)
-
-        # Find first occurrence
-        self._search_next()
+        # While the user keeps typing, the first match of the longer text can't
+        # come before the first match of the previous text, and there is none
+        # at all if the previous text wasn't found.
+        folded = search_text.lower()
+        start = 0
+        if self._search_anchor and folded.startswith(self._search_anchor[0]):
+            start = self._search_anchor[1]
+            if start < 0:
+                self._search_anchor = (folded, -1)
+                self.search_result_label.setText("Not found")
+                return
+
+        # Find first occurrence. This already covers the whole document, so a
+        # miss needs no wrap-around pass and leaves the view where it was.
+        cursor = self.log_text.document().find(search_text, start)
+        self._search_anchor = (folded, -1 if cursor.isNull() else cursor.selectionStart())
+        if cursor.isNull():
+            self.search_result_label.setText("Not found")
+            return
 
+        self.log_text.setTextCursor(cursor)
+        self.search_result_label.setText("✓")
+
+    def _run_pending_search(self) -> bool:
+        """Run a search still waiting for typing to pause, its first match comes before next/previous"""
+        if not self._search_timer.isActive():
+            return False
+        self._search_timer.stop()
+        self._search_logs()
+        return True
+
+    @Slot()
+    def _reset_search_anchor(self):
+        """Forget the last search position after the logs changed"""
+        self._search_anchor = None
+
+    @Slot()
     def _search_next(self):
         """Find next occurrence"""
+        if self._run_pending_search():
+            return
+
         search_text = self.search_entry.text()
         if not search_text:
             return
@@ -1296,9 +1748,11 @@ class FeedbackUI(QMainWindow):
             else:
                 self.search_result_label.setText("Not found")
 
+    @Slot()
     def _search_prev(self):
         """Find previous occurrence"""
-        from PySide6.QtGui import QTextDocument
+        if self._run_pending_search():
+            return
 
         search_text = self.search_entry.text()
         if not search_text:
@@ -1318,9 +1772,10 @@ class FeedbackUI(QMainWindow):
             else:
                 self.search_result_label.setText("Not found")
 
+    @Slot()
     def _copy_logs(self):
         """Copy logs to clipboard"""
-        logs = "".join(self.log_buffer)
+        logs = self._joined_logs()
         clipboard = QApplication.clipboard()
         clipboard.setText(logs)
         # Show temporary feedback
@@ -1328,9 +1783,9 @@ class FeedbackUI(QMainWindow):
         self.clear_button.setText("✓ Copied!")
         QTimer.singleShot(1500, lambda: self.clear_button.setText(original_text))
 
+    @Slot()
     def _export_logs(self):
         """Export logs to file"""
-        import datetime
         default_filename = f"feedback-logs-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.txt"
         filename, _ = QFileDialog.getSaveFileName(
             self,
@@ -1340,8 +1795,9 @@ class FeedbackUI(QMainWindow):
         )
         if filename:
             try:
-                with open(filename, "w") as f:
-                    f.write("".join(self.log_buffer))
+                # Write the chunks as they are instead of joining them into one big string
+                with open(filename, "w", encoding="utf-8") as f:
+                    f.writelines(self._iter_logs())
                 # Show temporary feedback
                 original_text = self.clear_button.text()
                 self.clear_button.setText("✓ Exported!")
@@ -1349,16 +1805,17 @@ class FeedbackUI(QMainWindow):
             except Exception as e:
                 self._append_log(f"Failed to export logs: {e}\n")
 
+    @Slot()
     def clear_logs(self):
-        self.log_buffer = []
+        self._clear_log_buffer()
         self.log_text.clear()
 
     def closeEvent(self, event):
-        # Save window geometry, state, and splitter sizes
-        settings = QSettings("UserFeedback", "MainWindow")
-        settings.setValue("geometry", self.saveGeometry())
-        settings.setValue("windowState", self.saveState())
-        settings.setValue("splitter_sizes", self.splitter.sizes())
+        # Save window geometry, state, and splitter sizes along with the other changed settings
+        self._set_setting("geometry", self.saveGeometry())
+        self._set_setting("windowState", self.saveState())
+        self._set_setting("splitter_sizes", self.splitter.sizes())
+        self._flush_settings()
 
         if self.process:
             kill_tree(self.process)
@@ -1372,7 +1829,7 @@ class FeedbackUI(QMainWindow):
             kill_tree(self.process)
 
         if not self.feedback_result:
-            return FeedbackResult(logs="".join(self.log_buffer), user_feedback="")
+            return FeedbackResult(logs=self._joined_logs(), user_feedback="")
 
         return self.feedback_result
 